@@ -5,6 +5,7 @@ import numpy as np
 import torch as T
 from gym import Env
 
+from pearll import settings
 from pearll.agents.base_agents import BaseAgent
 from pearll.buffers import BaseBuffer, RolloutBuffer
 from pearll.callbacks.base_callback import BaseCallback
@@ -127,7 +128,7 @@ class A2C(BaseAgent):
         self.gae_gamma = gae_gamma
 
     def _fit(self, batch_size: int, actor_epochs: int = 1, critic_epochs: int = 1):
-        critic_losses = np.zeros(shape=(critic_epochs))
+        critic_losses = T.zeros(critic_epochs, device=settings.DEVICE)
         actor_losses = np.zeros(shape=(actor_epochs))
         divergences = np.zeros(shape=(actor_epochs))
         entropies = np.zeros(shape=(actor_epochs))
@@ -175,7 +176,7 @@ class A2C(BaseAgent):
 
         return Log(
             actor_loss=actor_losses.mean(),
-            critic_loss=critic_losses.mean(),
+            critic_loss=critic_losses.mean().item(),
             divergence=divergences.sum(),
             entropy=entropies.mean(),
         )
@@ -9,6 +9,12 @@ from gym.vector import VectorEnv
 from pearll import settings
 from pearll.buffers.base_buffer import BaseBuffer
 from pearll.callbacks.base_callback import BaseCallback
+from pearll.common.distributed import (
+    all_processes_continue,
+    broadcast_parameters,
+    get_rank,
+    is_distributed,
+)
 from pearll.common.enumerations import FrequencyType
 from pearll.common.logging_ import Logger
 from pearll.common.type_aliases import Log, Observation, Tensor, Trajectories
@@ -34,7 +40,18 @@ class BaseAgent(ABC):
     See the example agents already done for guidance and settings.py for settings objects
     that can be used.
 
-    :param env: the gym-like environment to be used
+    To train with data parallelism, launch the script with e.g. `torchrun --nproc_per_node=N`
+    and call `torch.distributed.init_process_group` before creating the agent (set
+    `pearll.settings.DEVICE` to the local GPU before building the model). Each process
+    then steps its own environment with a different seed, and gradients are averaged
+    across processes by the actor, critic and environment model updaters. Processes agree
+    before each training step whether to continue, so they always run the same number of
+    training steps. Only the rank 0 process writes tensorboard logs and checkpoints.
+    Agents using evolutionary updaters (ES, AdamES, GA, CEM-RL) don't synchronize their
+    populations and can't be trained over multiple processes.
+
+    :param env: the gym-like environment to be used, a `gym.vector.AsyncVectorEnv` steps all
+        its environments concurrently in subprocesses with one call per step
     :param model: the neural network model
     :param buffer_class: the buffer class for storing and sampling trajectories
     :param buffer_settings: settings for the buffer
@@ -66,6 +83,7 @@ class BaseAgent(ABC):
             stream_handler_level=logger_settings.stream_handler_level,
             verbose=logger_settings.verbose,
             num_envs=env.num_envs if isinstance(env, VectorEnv) else 1,
+            write_frequency=logger_settings.write_frequency,
         )
         settings.DEVICE = get_device(settings.DEVICE)
         self.logger.info(f"Using device {settings.DEVICE}")
@@ -74,6 +92,16 @@ class BaseAgent(ABC):
         )
         self.env = env
         self.model = model
+        if misc_settings.compile_critics:
+            if hasattr(T.nn.Module, "compile"):
+                # Shapes are fixed by the batch size, so compile without dynamic shapes
+                for critic in self.model.critics:
+                    critic.compile(mode="reduce-overhead", dynamic=False)
+            else:
+                self.logger.warning(
+                    f"torch {T.__version__} does not support compiling modules, "
+                    "critics will not be compiled"
+                )
         self.render = misc_settings.render
         explorer_settings = explorer_settings.filter_none()
         self.action_explorer = action_explorer_class(
@@ -100,9 +128,17 @@ class BaseAgent(ABC):
         else:
             self.callbacks = None
 
+        if is_distributed():
+            self.logger.info(
+                f"Using process {get_rank()} of {T.distributed.get_world_size()}"
+            )
+            broadcast_parameters(self.model)
+
         if misc_settings.seed is not None:
-            self.logger.info(f"Using seed {misc_settings.seed}")
-            set_seed(misc_settings.seed, self.env)
+            # Offset by rank so each process collects different experience
+            seed = misc_settings.seed + get_rank()
+            self.logger.info(f"Using seed {seed}")
+            set_seed(seed, self.env)
 
     @T.no_grad()
     def predict(self, observations: Union[Tensor, Dict[str, Tensor]]) -> T.Tensor:
@@ -137,7 +173,8 @@ class BaseAgent(ABC):
 
     def step_env(self, observation: Observation, num_steps: int = 1) -> np.ndarray:
         """
-        Step the agent in the environment
+        Step the agent in the environment. With a `VectorEnv`, each step is a single batched
+        call collecting a transition from every environment at once.
 
         :param observation: the starting observation to step from
         :param num_steps: how many steps to take
@@ -147,13 +184,15 @@ class BaseAgent(ABC):
         for _ in range(num_steps):
             if self.render:
                 self.env.render()
-            action = self.action_explorer(self.model, observation, self.step)
+            # Actions are only used as numpy arrays so skip autograd tracking
+            with T.inference_mode():
+                action = self.action_explorer(self.model, observation, self.step)
             next_observation, reward, done, _ = self.env.step(action)
             self.buffer.add_trajectory(
                 observation, action, reward, next_observation, done
             )
             self.logger.debug(
-                f"{Trajectories(observation, action, reward, next_observation, done)}"
+                "%s", Trajectories(observation, action, reward, next_observation, done)
             )
             # Add reward to current episode log
             self.logger.add_reward(reward)
@@ -220,34 +259,42 @@ class BaseAgent(ABC):
             num_steps = num_steps // train_frequency[1]
 
         observation = self.env.reset()
-        for step in range(num_steps):
-            # Always fill buffer with enough samples for first training step
-            if step == 0:
-                observation = self.step_env(
-                    observation=observation, num_steps=batch_size
-                )
-            # Step for number of steps specified
-            elif train_frequency[0] == FrequencyType.STEP:
-                observation = self.step_env(
-                    observation=observation, num_steps=train_frequency[1]
-                )
-            # Step for number of episodes specified
-            elif train_frequency[0] == FrequencyType.EPISODE:
-                start_episode = self.episode
-                end_episode = start_episode + train_frequency[1]
-                while self.episode != end_episode:
-                    observation = self.step_env(observation=observation)
-                if self.step >= num_steps:
-                    break
+        # Write any buffered logs even if training is interrupted
+        try:
+            for step in range(num_steps):
+                stop = False
+                # Always fill buffer with enough samples for first training step
+                if step == 0:
+                    observation = self.step_env(
+                        observation=observation, num_steps=batch_size
+                    )
+                # Step for number of steps specified
+                elif train_frequency[0] == FrequencyType.STEP:
+                    observation = self.step_env(
+                        observation=observation, num_steps=train_frequency[1]
+                    )
+                # Step for number of episodes specified
+                elif train_frequency[0] == FrequencyType.EPISODE:
+                    start_episode = self.episode
+                    end_episode = start_episode + train_frequency[1]
+                    while self.episode != end_episode:
+                        observation = self.step_env(observation=observation)
+                    stop = self.step >= num_steps
 
-            if self.done:
-                break
+                # Processes must run the same number of training steps or their all-reduces deadlock
+                if not all_processes_continue(not (stop or self.done)):
+                    break
 
-            self.model.train()
-            train_log = self._fit(
-                batch_size=batch_size,
-                actor_epochs=actor_epochs,
-                critic_epochs=critic_epochs,
-            )
-            self.model.update_global()
-            self.logger.add_train_log(train_log)
+                self.model.train()
+                train_log = self._fit(
+                    batch_size=batch_size,
+                    actor_epochs=actor_epochs,
+                    critic_epochs=critic_epochs,
+                )
+                self.model.update_global()
+                self.logger.add_train_log(train_log)
+        finally:
+            self.logger.flush_log()
+            if self.callbacks is not None:
+                for callback in self.callbacks:
+                    callback.on_training_end()
@@ -8,6 +8,7 @@ import torch as T
 from gym import Env
 from gym.vector.vector_env import VectorEnv
 
+from pearll import settings
 from pearll.agents.base_agents import BaseAgent
 from pearll.buffers import ReplayBuffer
 from pearll.buffers.base_buffer import BaseBuffer
@@ -155,7 +156,7 @@ class CEM_RL(BaseAgent):
         )
 
     def _fit(self, batch_size: int, actor_epochs: int = 1, critic_epochs: int = 1):
-        critic_losses = np.zeros(critic_epochs)
+        critic_losses = T.zeros(critic_epochs, device=settings.DEVICE)
         divergences = np.zeros(actor_epochs)
         entropies = np.zeros(actor_epochs)
 
@@ -208,7 +209,10 @@ class CEM_RL(BaseAgent):
             observation = next_observation
             episode_dones = np.logical_or(episode_dones, done)
 
-        trajectories = self.buffer.last(episode_length, flatten_env=False)
+        # The actor updater scores the population with numpy arrays
+        trajectories = self.buffer.last(
+            episode_length, flatten_env=False, dtype="numpy"
+        )
         rewards = trajectories.rewards.squeeze()
         rewards = filter_rewards(rewards, trajectories.dones.squeeze())
         if rewards.ndim > 1:
@@ -229,7 +233,7 @@ class CEM_RL(BaseAgent):
         self.model.update_targets()
 
         return Log(
-            critic_loss=np.mean(critic_losses),
+            critic_loss=critic_losses.mean().item(),
             divergence=np.mean(divergences),
             entropy=np.mean(entropies),
         )
@@ -4,6 +4,7 @@ import numpy as np
 import torch as T
 from gym import Env
 
+from pearll import settings
 from pearll.agents.base_agents import BaseAgent
 from pearll.buffers import ReplayBuffer
 from pearll.buffers.base_buffer import BaseBuffer
@@ -133,7 +134,7 @@ class DDPG(BaseAgent):
         self.td_gamma = td_gamma
 
     def _fit(self, batch_size: int, actor_epochs: int = 1, critic_epochs: int = 1):
-        critic_losses = np.zeros(shape=(critic_epochs))
+        critic_losses = T.zeros(critic_epochs, device=settings.DEVICE)
         actor_losses = np.zeros(shape=(actor_epochs))
         # Train critic for critic_epochs
         for i in range(critic_epochs):
@@ -172,5 +173,5 @@ class DDPG(BaseAgent):
 
         return Log(
             actor_loss=np.mean(actor_losses),
-            critic_loss=np.mean(critic_losses),
+            critic_loss=critic_losses.mean().item(),
         )
@@ -1,9 +1,9 @@
 from typing import List, Optional, Type
 
-import numpy as np
 import torch as T
 from gym import Env
 
+from pearll import settings
 from pearll.agents.base_agents import BaseAgent
 from pearll.buffers.base_buffer import BaseBuffer
 from pearll.buffers.replay_buffer import ReplayBuffer
@@ -106,7 +106,7 @@ class DQN(BaseAgent):
     def _fit(
         self, batch_size: int, actor_epochs: int = 1, critic_epochs: int = 1
     ) -> Log:
-        critic_losses = np.zeros(shape=(critic_epochs))
+        critic_losses = T.zeros(critic_epochs, device=settings.DEVICE)
         for i in range(critic_epochs):
             trajectories = self.buffer.sample(batch_size=batch_size, flatten_env=False)
 
@@ -133,4 +133,4 @@ class DQN(BaseAgent):
 
         self.model.assign_targets()
 
-        return Log(critic_loss=critic_losses.mean())
+        return Log(critic_loss=critic_losses.mean().item())
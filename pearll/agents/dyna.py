@@ -4,9 +4,11 @@ import numpy as np
 import torch as T
 from gym import Env
 
+from pearll import settings
 from pearll.agents import BaseAgent
 from pearll.buffers import BaseBuffer, ReplayBuffer
 from pearll.callbacks.base_callback import BaseCallback
+from pearll.common.distributed import all_processes_continue, is_distributed
 from pearll.common.enumerations import FrequencyType
 from pearll.common.type_aliases import Log, Observation, Trajectories
 from pearll.explorers.base_explorer import BaseExplorer
@@ -129,13 +131,15 @@ class DynaQ(BaseAgent):
         """
         self.model.eval()
         for _ in range(num_steps):
-            action = self.action_explorer(self.model, observation, self.step)
+            # Actions are only used as numpy arrays so skip autograd tracking
+            with T.inference_mode():
+                action = self.action_explorer(self.model, observation, self.step)
             next_observation, reward, done, _ = self.env_model.step(observation, action)
             self.buffer.add_trajectory(
                 observation, action, reward, next_observation, done
             )
             self.logger.debug(
-                Trajectories(observation, action, reward, next_observation, done)
+                "%s", Trajectories(observation, action, reward, next_observation, done)
             )
             observation = next_observation
 
@@ -192,7 +196,7 @@ class DynaQ(BaseAgent):
     def _fit(
         self, batch_size: int, actor_epochs: int = 1, critic_epochs: int = 1
     ) -> Log:
-        critic_losses = np.zeros(shape=(critic_epochs))
+        critic_losses = T.zeros(critic_epochs, device=settings.DEVICE)
         for i in range(critic_epochs):
             trajectories = self.buffer.sample(batch_size=batch_size, flatten_env=False)
 
@@ -219,7 +223,7 @@ class DynaQ(BaseAgent):
 
         self.model.assign_targets()
 
-        return Log(critic_loss=np.mean(critic_losses))
+        return Log(critic_loss=critic_losses.mean().item())
 
     def fit(
         self,
@@ -256,6 +260,7 @@ class DynaQ(BaseAgent):
             To run every n episodes, use `("episode", n)`.
             To run every n steps, use `("step", n)`.
         :param no_model_steps: number of steps to run without collecting trajectories from the model environment.
+            When training over multiple processes, only step based train frequencies are supported.
         """
         env_train_frequency = (
             FrequencyType(env_train_frequency[0].lower()),
@@ -266,6 +271,14 @@ class DynaQ(BaseAgent):
             plan_train_frequency[1],
         )
 
+        if is_distributed() and FrequencyType.EPISODE in (
+            env_train_frequency[0],
+            plan_train_frequency[0],
+        ):
+            raise NotImplementedError(
+                "Episode based train frequencies aren't supported when training over multiple processes"
+            )
+
         # We can pre-calculate how many training steps to run if train frequency is in steps rather than episodes
         if env_train_frequency[0] == FrequencyType.STEP:
             env_steps = env_steps // env_train_frequency[1]
@@ -273,57 +286,32 @@ class DynaQ(BaseAgent):
             plan_steps = plan_steps // plan_train_frequency[1]
 
         observation = self.env.reset()
-        for _ in range(env_steps):
-            self.logger.debug("REAL ENVIRONMENT")
-            # Step for number of steps specified
-            if env_train_frequency[0] == FrequencyType.STEP:
-                observation = self.step_env(
-                    observation=observation, num_steps=env_train_frequency[1]
-                )
-            # Step for number of episodes specified
-            elif env_train_frequency[0] == FrequencyType.EPISODE:
-                start_episode = self.episode
-                end_episode = start_episode + env_train_frequency[1]
-                while self.episode != end_episode:
-                    observation = self.step_env(observation=observation)
-                if self.step >= env_steps:
-                    break
-
-            if self.done:
-                break
+        # Write any buffered logs even if training is interrupted
+        try:
+            for _ in range(env_steps):
+                self.logger.debug("REAL ENVIRONMENT")
+                # Step for number of steps specified
+                if env_train_frequency[0] == FrequencyType.STEP:
+                    observation = self.step_env(
+                        observation=observation, num_steps=env_train_frequency[1]
+                    )
+                # Step for number of episodes specified
+                elif env_train_frequency[0] == FrequencyType.EPISODE:
+                    start_episode = self.episode
+                    end_episode = start_episode + env_train_frequency[1]
+                    while self.episode != end_episode:
+                        observation = self.step_env(observation=observation)
+                    if self.step >= env_steps:
+                        break
 
-            # Update the environment model
-            self._fit_model_env(batch_size=env_batch_size, epochs=env_epochs)
+                # Processes must run the same number of training steps or their all-reduces deadlock
+                if not all_processes_continue(not self.done):
+                    break
 
-            if self.step < no_model_steps:
-                # Update the agent model
-                self.model.train()
-                train_log = self._fit(
-                    batch_size=plan_batch_size,
-                    actor_epochs=actor_epochs,
-                    critic_epochs=critic_epochs,
-                )
-                self.model.update_global()
-                self.logger.add_train_log(train_log)
-            else:
-                self.logger.debug("MODEL ENVIRONMENT")
-                # Plan for number of steps specified
-                model_obs = self.env_model.reset()
-                for _ in range(plan_steps):
-                    # Step for number of steps specified
-                    if plan_train_frequency[0] == FrequencyType.STEP:
-                        model_obs = self.step_model_env(
-                            observation=model_obs, num_steps=plan_train_frequency[1]
-                        )
-                    # Step for number of episodes specified
-                    elif plan_train_frequency[0] == FrequencyType.EPISODE:
-                        start_episode = self.model_episode
-                        end_episode = start_episode + plan_train_frequency[1]
-                        while self.model_episode != end_episode:
-                            observation = self.step_model_env(observation=observation)
-                        if self.model_step >= plan_steps:
-                            break
+                # Update the environment model
+                self._fit_model_env(batch_size=env_batch_size, epochs=env_epochs)
 
+                if self.step < no_model_steps:
                     # Update the agent model
                     self.model.train()
                     train_log = self._fit(
@@ -333,5 +321,40 @@ class DynaQ(BaseAgent):
                     )
                     self.model.update_global()
                     self.logger.add_train_log(train_log)
+                else:
+                    self.logger.debug("MODEL ENVIRONMENT")
+                    # Plan for number of steps specified
+                    model_obs = self.env_model.reset()
+                    for _ in range(plan_steps):
+                        # Step for number of steps specified
+                        if plan_train_frequency[0] == FrequencyType.STEP:
+                            model_obs = self.step_model_env(
+                                observation=model_obs, num_steps=plan_train_frequency[1]
+                            )
+                        # Step for number of episodes specified
+                        elif plan_train_frequency[0] == FrequencyType.EPISODE:
+                            start_episode = self.model_episode
+                            end_episode = start_episode + plan_train_frequency[1]
+                            while self.model_episode != end_episode:
+                                observation = self.step_model_env(
+                                    observation=observation
+                                )
+                            if self.model_step >= plan_steps:
+                                break
+
+                        # Update the agent model
+                        self.model.train()
+                        train_log = self._fit(
+                            batch_size=plan_batch_size,
+                            actor_epochs=actor_epochs,
+                            critic_epochs=critic_epochs,
+                        )
+                        self.model.update_global()
+                        self.logger.add_train_log(train_log)
 
-                self.buffer.reset()
+                    self.buffer.reset()
+        finally:
+            self.logger.flush_log()
+            if self.callbacks is not None:
+                for callback in self.callbacks:
+                    callback.on_training_end()
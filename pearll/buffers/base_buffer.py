@@ -1,17 +1,18 @@
 import warnings
 from abc import ABC, abstractmethod
-from typing import Union
+from typing import Optional, Union
 
 import numpy as np
 import psutil
 import torch as T
 from gym import Env
 from gym.vector import VectorEnv
+from numpy.typing import DTypeLike
 
 from pearll import settings
 from pearll.common.enumerations import TrajectoryType
 from pearll.common.type_aliases import Observation, Trajectories
-from pearll.common.utils import get_space_shape
+from pearll.common.utils import get_space_dtype, get_space_shape
 
 
 class BaseBuffer(ABC):
@@ -20,17 +21,23 @@ class BaseBuffer(ABC):
 
     :param env: the environment
     :param buffer_size: max number of elements in the buffer
+    :param observation_dtype: optional data type to store observations as, e.g. np.float16 to
+        halve memory usage. Defaults to the observation space data type. The built-in encoders
+        cast inputs to float32 on the device, so the learning computations are unchanged.
+        Custom encoders need to do the same.
     """
 
     def __init__(
         self,
         env: Env,
         buffer_size: int,
+        observation_dtype: Optional[DTypeLike] = None,
     ) -> None:
         self.env = env
         self.buffer_size = buffer_size
         self.full = False
         self.pos = 0
+        self._copy_stream = None
 
         self.num_envs = env.num_envs if isinstance(env, VectorEnv) else 1
 
@@ -42,14 +49,22 @@ class BaseBuffer(ABC):
 
         self.obs_shape = get_space_shape(env.observation_space)
         self.action_shape = get_space_shape(env.action_space)
+        self.obs_dtype = (
+            env.observation_space.dtype
+            if observation_dtype is None
+            else np.dtype(observation_dtype)
+        )
+        # Store actions in their native type (e.g. int64 for discrete actions) so they
+        # can be used directly as indices without converting every update
+        self.action_dtype = get_space_dtype(env.action_space)
 
         self.observations = np.zeros(
             (self.buffer_size,) + self.obs_shape,
-            dtype=env.observation_space.dtype,
+            dtype=self.obs_dtype,
         )
         self.actions = np.zeros(
             (self.buffer_size,) + self.action_shape,
-            dtype=env.action_space.dtype,
+            dtype=self.action_dtype,
         )
         # Use 3 dims for easier calculations without having to think about broadcasting
         self.rewards = np.zeros(self.batch_shape + (1,), dtype=np.float32)
@@ -70,6 +85,32 @@ class BaseBuffer(ABC):
                 f"replay buffer: {total_memory_usage:.2f}GB > {mem_available:.2f}GB"
             )
 
+    def _to_device(self, data: np.ndarray) -> T.Tensor:
+        """
+        Transfer sampled data to the device. Data bound for a GPU is first copied to
+        page-locked memory and then transferred on a separate CUDA stream, so the copy
+        can overlap with work still queued on the compute stream (e.g. the previous
+        backward pass).
+
+        :param data: the data to transfer
+        :return: the data as a torch tensor on the device
+        """
+        tensor = T.from_numpy(data)
+        device = T.device(settings.DEVICE)
+        if device.type != "cuda":
+            return tensor.to(device, non_blocking=True)
+
+        if self._copy_stream is None:
+            self._copy_stream = T.cuda.Stream(device=device)
+        tensor = tensor.pin_memory()
+        with T.cuda.stream(self._copy_stream):
+            tensor = tensor.to(device, non_blocking=True)
+        compute_stream = T.cuda.current_stream(device)
+        compute_stream.wait_stream(self._copy_stream)
+        # The tensor was allocated on the copy stream but is used on the compute stream
+        tensor.record_stream(compute_stream)
+        return tensor
+
     def _flatten_env_axis(
         self,
         data: np.ndarray,
@@ -130,15 +171,11 @@ class BaseBuffer(ABC):
 
         # return torch tensors instead of numpy arrays
         if dtype == TrajectoryType.TORCH:
-            observations = T.from_numpy(observations).to(
-                settings.DEVICE, non_blocking=True
-            )
-            actions = T.from_numpy(actions).to(settings.DEVICE, non_blocking=True)
-            rewards = T.from_numpy(rewards).to(settings.DEVICE, non_blocking=True)
-            next_observations = T.from_numpy(next_observations).to(
-                settings.DEVICE, non_blocking=True
-            )
-            dones = T.from_numpy(dones).to(settings.DEVICE, non_blocking=True)
+            observations = self._to_device(observations)
+            actions = self._to_device(actions)
+            rewards = self._to_device(rewards)
+            next_observations = self._to_device(next_observations)
+            dones = self._to_device(dones)
 
         return Trajectories(
             observations=observations,
@@ -157,11 +194,11 @@ class BaseBuffer(ABC):
 
         self.observations = np.zeros(
             (self.buffer_size,) + self.obs_shape,
-            dtype=self.env.observation_space.dtype,
+            dtype=self.obs_dtype,
         )
         self.actions = np.zeros(
             (self.buffer_size,) + self.action_shape,
-            dtype=self.env.action_space.dtype,
+            dtype=self.action_dtype,
         )
         self.rewards = np.zeros(self.batch_shape + (1,), dtype=np.float32)
         self.dones = np.zeros(self.batch_shape + (1,), dtype=np.float32)
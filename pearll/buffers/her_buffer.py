@@ -1,10 +1,9 @@
-from typing import Dict, Tuple, Union
+from typing import Dict, Optional, Tuple, Union
 
 import numpy as np
-import torch as T
 from gym.core import GoalEnv
+from numpy.typing import DTypeLike
 
-from pearll import settings
 from pearll.buffers.base_buffer import BaseBuffer
 from pearll.common.enumerations import GoalSelectionStrategy, TrajectoryType
 from pearll.common.type_aliases import DictTrajectories, Tensor
@@ -26,6 +25,8 @@ class HERBuffer(BaseBuffer):
     :param buffer_size: max number of elements in the buffer
     :param goal_selection_strategy: the goal selection strategy to be used, defaults to future
     :param n_sampled_goal: ratio of HER data to data coming from normal experience replay
+    :param observation_dtype: optional data type to store observations as, defaults to the
+        observation space data type
     """
 
     def __init__(
@@ -34,16 +35,17 @@ class HERBuffer(BaseBuffer):
         buffer_size: int,
         goal_selection_strategy: Union[str, GoalSelectionStrategy] = "future",
         n_sampled_goal: int = 4,
+        observation_dtype: Optional[DTypeLike] = None,
     ) -> None:
-        super().__init__(env, buffer_size)
+        super().__init__(env, buffer_size, observation_dtype)
         self.env = env
         self.desired_goals = np.zeros(
             (self.buffer_size,) + self.obs_shape,
-            dtype=env.observation_space.dtype,
+            dtype=self.obs_dtype,
         )
         self.next_achieved_goals = np.zeros(
             (self.buffer_size,) + self.obs_shape,
-            dtype=env.observation_space.dtype,
+            dtype=self.obs_dtype,
         )
 
         # Keep track of where in the data structure episodes end
@@ -77,11 +79,11 @@ class HERBuffer(BaseBuffer):
 
         self.desired_goals = np.zeros(
             (self.buffer_size,) + self.obs_shape,
-            dtype=self.env.observation_space.dtype,
+            dtype=self.obs_dtype,
         )
         self.next_achieved_goals = np.zeros(
             (self.buffer_size,) + self.obs_shape,
-            dtype=self.env.observation_space.dtype,
+            dtype=self.obs_dtype,
         )
 
         # Keep track of where in the data structure episodes end
@@ -224,27 +226,21 @@ class HERBuffer(BaseBuffer):
         trajectories = list(self._sample_trajectories(batch_inds))
 
         if dtype == TrajectoryType.TORCH:
-            trajectories[0]["observation"] = T.from_numpy(
+            trajectories[0]["observation"] = self._to_device(
                 trajectories[0]["observation"]
-            ).to(settings.DEVICE, non_blocking=True)
-            trajectories[0]["desired_goal"] = T.from_numpy(
-                trajectories[0]["desired_goal"]
-            ).to(settings.DEVICE, non_blocking=True)
-            trajectories[1] = T.from_numpy(trajectories[1]).to(
-                settings.DEVICE, non_blocking=True
             )
-            trajectories[2] = T.from_numpy(trajectories[2]).to(
-                settings.DEVICE, non_blocking=True
+            trajectories[0]["desired_goal"] = self._to_device(
+                trajectories[0]["desired_goal"]
             )
-            trajectories[3]["observation"] = T.from_numpy(
+            trajectories[1] = self._to_device(trajectories[1])
+            trajectories[2] = self._to_device(trajectories[2])
+            trajectories[3]["observation"] = self._to_device(
                 trajectories[3]["observation"]
-            ).to(settings.DEVICE, non_blocking=True)
-            trajectories[3]["desired_goal"] = T.from_numpy(
+            )
+            trajectories[3]["desired_goal"] = self._to_device(
                 trajectories[3]["desired_goal"]
-            ).to(settings.DEVICE, non_blocking=True)
-            trajectories[4] = T.from_numpy(trajectories[4]).to(
-                settings.DEVICE, non_blocking=True
             )
+            trajectories[4] = self._to_device(trajectories[4])
 
         return DictTrajectories(
             observations=trajectories[0],
@@ -1,7 +1,8 @@
-from typing import Union
+from typing import Optional, Union
 
 import numpy as np
 from gym import Env
+from numpy.typing import DTypeLike
 
 from pearll.buffers.base_buffer import BaseBuffer
 from pearll.common.enumerations import TrajectoryType
@@ -19,16 +20,20 @@ class ReplayBuffer(BaseBuffer):
 
     :param env: the environment
     :param buffer_size: max number of elements in the buffer
+    :param observation_dtype: optional data type to store observations as, defaults to the
+        observation space data type
     """
 
     def __init__(
         self,
         env: Env,
         buffer_size: int,
+        observation_dtype: Optional[DTypeLike] = None,
     ) -> None:
         super().__init__(
             env,
             buffer_size,
+            observation_dtype,
         )
         self._check_system_memory(
             self.observations, self.actions, self.rewards, self.dones
@@ -1,8 +1,9 @@
-from typing import Union
+from typing import Optional, Union
 
 import numpy as np
 import torch as T
 from gym import Env
+from numpy.typing import DTypeLike
 
 from pearll.buffers.base_buffer import BaseBuffer
 from pearll.common.enumerations import TrajectoryType
@@ -15,20 +16,24 @@ class RolloutBuffer(BaseBuffer):
 
     :param env: the environment
     :param buffer_size: max number of elements in the buffer
+    :param observation_dtype: optional data type to store observations as, defaults to the
+        observation space data type
     """
 
     def __init__(
         self,
         env: Env,
         buffer_size: int,
+        observation_dtype: Optional[DTypeLike] = None,
     ) -> None:
         super().__init__(
             env,
             buffer_size,
+            observation_dtype,
         )
         self.next_observations = np.zeros(
             (self.buffer_size,) + self.obs_shape,
-            dtype=env.observation_space.dtype,
+            dtype=self.obs_dtype,
         )
         self._check_system_memory(
             self.observations,
@@ -42,7 +47,7 @@ class RolloutBuffer(BaseBuffer):
         super().reset()
         self.next_observations = np.zeros(
             (self.buffer_size,) + self.obs_shape,
-            dtype=self.env.observation_space.dtype,
+            dtype=self.obs_dtype,
         )
 
     def add_trajectory(
@@ -33,3 +33,9 @@ class BaseCallback(ABC):
         self.step = step
 
         return self._on_step()
+
+    def on_training_end(self) -> None:
+        """
+        This method will be called by the model when training ends, including when
+        training is interrupted by an error.
+        """
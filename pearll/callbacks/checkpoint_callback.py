@@ -1,13 +1,29 @@
 import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
 
 import torch as T
 
 from pearll.callbacks.base_callback import BaseCallback
+from pearll.common.distributed import get_rank
 from pearll.common.logging_ import Logger
 from pearll.models.actor_critics import ActorCritic
 
 
 class CheckpointCallback(BaseCallback):
+    """
+    Periodically save the model weights.
+    Weights are copied to the CPU on the calling thread and written to disk on a background thread,
+    so training continues while the checkpoint is written. The last checkpoint is waited for
+    when training ends; when calling `save` directly, call `wait_for_save` before exiting.
+
+    :param logger: the agent logger
+    :param model: the model to save
+    :param save_freq: save every `save_freq` calls
+    :param save_path: directory to save checkpoints in
+    :param name_prefix: prefix of the checkpoint file names
+    """
+
     def __init__(
         self,
         logger: Logger,
@@ -20,11 +36,14 @@ class CheckpointCallback(BaseCallback):
         self.save_freq = save_freq
         self.save_path = save_path
         self.name_prefix = name_prefix
+        self._io_pool: Optional[ThreadPoolExecutor] = None
+        self._pending_save: Optional[Future] = None
 
         os.makedirs(save_path, exist_ok=True)
 
     def load(self, path: str):
-        """Load the model"""
+        """Load the model, waiting for any checkpoint still being written"""
+        self.wait_for_save()
         path = path + ".pt"
         self.logger.info(f"Loading weights from {path}")
         try:
@@ -33,13 +52,37 @@ class CheckpointCallback(BaseCallback):
             self.logger.info("File not found, assuming no model dict was to be loaded")
 
     def save(self, path: str):
-        """Save the model"""
+        """Save the model, the file is written in the background"""
+        # Surface any error from the previous write before queueing the next one
+        self.wait_for_save()
         path = path + ".pt"
         self.logger.info(f"Saving weights to {path}")
-        T.save(self.model.state_dict(), path)
+        # Copy even when already on the CPU so training can't modify the weights mid-write
+        state_dict = self.model.state_dict()
+        for key, value in state_dict.items():
+            state_dict[key] = value.detach().to("cpu", copy=True)
+        if self._io_pool is None:
+            self._io_pool = ThreadPoolExecutor(max_workers=1)
+        self._pending_save = self._io_pool.submit(T.save, state_dict, path)
+
+    def wait_for_save(self) -> None:
+        """Block until the last checkpoint has been written"""
+        if self._pending_save is not None:
+            pending_save, self._pending_save = self._pending_save, None
+            pending_save.result()
+
+    def on_training_end(self) -> None:
+        """Wait for the last checkpoint and stop the background writer"""
+        try:
+            self.wait_for_save()
+        finally:
+            if self._io_pool is not None:
+                self._io_pool.shutdown()
+                self._io_pool = None
 
     def _on_step(self) -> bool:
-        if self.n_calls % self.save_freq == 0:
+        # Every process holds the same weights, so only rank 0 saves them
+        if self.n_calls % self.save_freq == 0 and get_rank() == 0:
             path = os.path.join(self.save_path, f"{self.name_prefix}_{self.step}_steps")
             self.save(path)
         return True
@@ -0,0 +1,70 @@
+"""Helpers for data-parallel training over multiple processes, e.g. launched with torchrun"""
+
+from typing import Iterable
+
+import torch as T
+from torch.nn.parameter import Parameter
+
+from pearll import settings
+
+
+def is_distributed() -> bool:
+    """Check whether a distributed process group has been initialized"""
+    return T.distributed.is_available() and T.distributed.is_initialized()
+
+
+def get_rank() -> int:
+    """Get the rank of this process, 0 if not distributed"""
+    return T.distributed.get_rank() if is_distributed() else 0
+
+
+def all_processes_continue(should_continue: bool) -> bool:
+    """
+    Agree across processes on whether to run another training step. Each process must make
+    the same number of collective calls in the updaters, so training stops on every process
+    as soon as one of them stops.
+
+    :param should_continue: whether this process wants to continue training
+    :return: whether all processes want to continue training
+    """
+    if not is_distributed():
+        return should_continue
+    # NCCL only reduces tensors on the process's GPU, which is the device the model is on
+    if T.distributed.get_backend() == "nccl":
+        device = T.device(settings.DEVICE)
+    else:
+        device = T.device("cpu")
+    flag = T.tensor(int(should_continue), device=device)
+    T.distributed.all_reduce(flag, op=T.distributed.ReduceOp.MIN)
+    return bool(flag.item())
+
+
+def broadcast_parameters(module: T.nn.Module) -> None:
+    """
+    Copy the parameters and buffers of the rank 0 process to all other processes
+    so every replica starts training from the same point.
+
+    :param module: the module to synchronize
+    """
+    for tensor in list(module.parameters()) + list(module.buffers()):
+        T.distributed.broadcast(tensor.data, src=0)
+
+
+def average_gradients(parameters: Iterable[Parameter]) -> None:
+    """
+    Average gradients over all processes. Gradients are flattened into a single
+    bucket so only one all-reduce is needed per optimization step.
+
+    :param parameters: the parameters with gradients to average
+    """
+    grads = [param.grad for param in parameters if param.grad is not None]
+    if not grads:
+        return
+    bucket = T.cat([grad.reshape(-1) for grad in grads])
+    T.distributed.all_reduce(bucket)
+    bucket /= T.distributed.get_world_size()
+    offset = 0
+    for grad in grads:
+        numel = grad.numel()
+        grad.copy_(bucket[offset : offset + numel].view_as(grad))
+        offset += numel
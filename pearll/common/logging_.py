@@ -1,15 +1,17 @@
 import logging
-from typing import Optional, Union
+from typing import List, Optional, Tuple, Union
 
 import numpy as np
 from torch.utils.tensorboard import SummaryWriter
 
+from pearll.common.distributed import get_rank
 from pearll.common.type_aliases import Log
 
 
 def get_logger(file_handler_level: int, stream_handler_level: int) -> logging.Logger:
     logger = logging.getLogger(__name__)
-    logger.setLevel(logging.DEBUG)
+    # Drop records below both handler levels before they are created
+    logger.setLevel(min(file_handler_level, stream_handler_level))
 
     if logger.hasHandlers():
         logger.handlers.clear()
@@ -26,13 +28,15 @@ def get_logger(file_handler_level: int, stream_handler_level: int) -> logging.Lo
 
 class Logger(object):
     """
-    The Logger object combines the torch SummaryWriter with python in-built logging
+    The Logger object combines the torch SummaryWriter with python in-built logging.
+    When training over multiple processes, only the rank 0 process writes logs.
 
     :param tensorboard_log_path: path to store the tensorboard log
     :param file_handler_level: logging level for the file log
     :param stream_handeler_level: logging level for the streaming log
     :param verbose: whether to display at all or not
     :param num_envs: number of environments to run, useful for multi-agent
+    :param write_frequency: number of logs to buffer before writing them to tensorboard
     """
 
     def __init__(
@@ -42,11 +46,18 @@ class Logger(object):
         stream_handler_level: int = logging.INFO,
         verbose: bool = True,
         num_envs: int = 1,
+        write_frequency: int = 10,
     ) -> None:
-        self.writer = SummaryWriter(tensorboard_log_path)
-        self.logger = get_logger(file_handler_level, stream_handler_level)
-        self.verbose = verbose
+        if get_rank() == 0:
+            self.writer = SummaryWriter(tensorboard_log_path)
+            self.logger = get_logger(file_handler_level, stream_handler_level)
+        else:
+            self.writer = None
+            self.logger = logging.getLogger(__name__)
+        self.verbose = verbose and self.writer is not None
         self.num_envs = num_envs
+        self.write_frequency = write_frequency
+        self._log_buffer: List[Tuple[int, Log]] = []
         self.actor_losses = []
         self.critic_losses = []
         self.divergences = []
@@ -112,28 +123,47 @@ class Logger(object):
         return episode_log
 
     def write_log(self, step: int) -> None:
-        """Write a log to tensorboard and python logging"""
+        """
+        Write a log to python logging and buffer it for tensorboard.
+        The buffer is written to tensorboard every `write_frequency` logs.
+        """
         episode_log = self._make_episode_log()
-        self.writer.add_scalar("Reward/episode_reward", episode_log.reward, step)
-        if episode_log.actor_loss is not None:
-            self.writer.add_scalar("Loss/actor_loss", episode_log.actor_loss, step)
-        if episode_log.critic_loss is not None:
-            self.writer.add_scalar("Loss/critic_loss", episode_log.critic_loss, step)
-        if episode_log.divergence is not None:
-            self.writer.add_scalar("Metrics/divergence", episode_log.divergence, step)
-        if episode_log.entropy is not None:
-            self.writer.add_scalar("Metrics/entropy", episode_log.entropy, step)
+        if self.writer is not None:
+            self._log_buffer.append((step, episode_log))
+            if len(self._log_buffer) >= self.write_frequency:
+                self.flush_log()
 
         if self.verbose:
             self.logger.info(f"{step}: {episode_log}")
 
+    def flush_log(self) -> None:
+        """Write all buffered logs to tensorboard"""
+        if self.writer is None:
+            return
+        for step, episode_log in self._log_buffer:
+            self.writer.add_scalar("Reward/episode_reward", episode_log.reward, step)
+            if episode_log.actor_loss is not None:
+                self.writer.add_scalar("Loss/actor_loss", episode_log.actor_loss, step)
+            if episode_log.critic_loss is not None:
+                self.writer.add_scalar(
+                    "Loss/critic_loss", episode_log.critic_loss, step
+                )
+            if episode_log.divergence is not None:
+                self.writer.add_scalar(
+                    "Metrics/divergence", episode_log.divergence, step
+                )
+            if episode_log.entropy is not None:
+                self.writer.add_scalar("Metrics/entropy", episode_log.entropy, step)
+        self._log_buffer = []
+
     def info(self, msg: str):
         if self.verbose:
             self.logger.info(msg)
 
-    def debug(self, msg: str):
+    def debug(self, msg: str, *args):
+        """Log a debug message, `args` are only formatted into `msg` if the message is emitted"""
         if self.verbose:
-            self.logger.debug(msg)
+            self.logger.debug(msg, *args)
 
     def warning(self, msg: str):
         if self.verbose:
@@ -54,7 +54,11 @@ def to_numpy(*data) -> Union[Tuple[np.ndarray], np.ndarray]:
     result = [None] * len(data)
     for i, el in enumerate(data):
         if isinstance(el, T.Tensor):
-            result[i] = el.detach().cpu().numpy()
+            # CPU tensors outside autograd (e.g. under inference mode) can be viewed directly
+            if not el.requires_grad and el.device.type == "cpu":
+                result[i] = el.numpy()
+            else:
+                result[i] = el.detach().cpu().numpy()
         else:
             result[i] = np.asarray(el)
 
@@ -113,6 +117,21 @@ def get_space_range(space: spaces.Space) -> Tuple[Any, Any]:
         raise NotImplementedError(f"{space} observation space is not supported")
 
 
+def get_space_dtype(space: spaces.Space) -> np.dtype:
+    """
+    Get the data type of a space (useful for the buffers).
+    Composite spaces take the data type of their elements.
+    :param space:
+    :return:
+    """
+    if isinstance(space, spaces.Tuple):
+        return get_space_dtype(space.spaces[0])
+    elif isinstance(space, spaces.Dict):
+        return get_space_dtype(space["observation"])
+    else:
+        return space.dtype
+
+
 def extend_shape(original_shape: Tuple, new_size: int, axis: int = 0) -> Tuple:
     """Extend a dimension of a shape tuple"""
 
@@ -146,18 +165,13 @@ def set_seed(seed: int, env: Env) -> None:
 def filter_rewards(rewards: np.ndarray, dones: np.ndarray) -> np.ndarray:
     """
     Filter rewards based on done flags, all rewards after a done are set to 0.
+    The input rewards are not modified.
     :param rewards: The rewards to filter (num_envs, num_steps) or (num_steps,)
     :param dones: The done flags (num_envs, num_steps) or (num_steps,)
     :return: The filtered rewards
     """
-    if rewards.ndim == 1:
-        rewards = rewards[np.newaxis, :]
-        dones = dones[np.newaxis, :]
-    for i, env_dones in enumerate(dones):
-        done_indices = np.where(env_dones == 1)[0]
-        if done_indices.size > 0:
-            done_index = done_indices[0] + 1
-            if done_index < rewards.shape[1]:
-                rewards[i, done_index:] = 0
+    # Count the done flags strictly before each step, any step after the first done is masked
+    after_done = (np.cumsum(dones, axis=-1) - dones) > 0
+    rewards = np.where(after_done, 0, rewards)
 
     return rewards.squeeze()
@@ -93,7 +93,8 @@ class CNNEncoder(T.nn.Module):
         self.linear = T.nn.Sequential(T.nn.Linear(n_flatten, output_size), T.nn.ReLU())
 
     def forward(self, observations: Tensor) -> T.Tensor:
-        return self.linear(self.cnn(observations))
+        input = preprocess_inputs(observations, None)
+        return self.linear(self.cnn(input))
 
 
 class DictEncoder(T.nn.Module):
@@ -6,6 +6,7 @@ from typing import Any, Dict, Optional, Tuple, Type, Union
 
 import numpy as np
 import torch as T
+from numpy.typing import DTypeLike
 from torch.optim.optimizer import Optimizer
 
 from pearll.common.enumerations import Distribution
@@ -29,10 +30,13 @@ class MiscellaneousSettings(Settings):
 
     :param seed: random seed
     :param render: whether to render the environment
+    :param compile_critics: whether to compile the critic networks with `torch.compile`,
+        requires torch >= 2.2
     """
 
     render: bool = False
     seed: Optional[int] = None
+    compile_critics: bool = False
 
 
 @dataclass
@@ -92,9 +96,13 @@ class BufferSettings(Settings):
     Settings for buffers
 
     :buffer_size: max number of transitions to store at once in each environment
+    :observation_dtype: optional data type to store observations as, e.g. np.float16 to halve
+        memory usage, defaults to the observation space data type. Custom encoders need to
+        cast their inputs to float32.
     """
 
     buffer_size: int = int(1e6)
+    observation_dtype: Optional[DTypeLike] = None
 
 
 @dataclass
@@ -106,6 +114,7 @@ class LoggerSettings(Settings):
     :param file_handler_level: logging level for the file log
     :param stream_handler_level: logging level for the streaming log
     :param verbose: whether to record any logs at all
+    :param write_frequency: number of logs to buffer before writing them to tensorboard
     """
 
     tensorboard_log_path: Optional[str] = None
@@ -113,6 +122,7 @@ class LoggerSettings(Settings):
     file_handler_level: int = logging.DEBUG
     stream_handler_level: int = logging.INFO
     verbose: bool = True
+    write_frequency: int = 10
 
 
 @dataclass
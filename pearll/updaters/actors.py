@@ -1,10 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import Iterator, Type, Union
+from typing import List, Type, Union
 
 import torch as T
 from torch.distributions import kl_divergence
 from torch.nn.parameter import Parameter
 
+from pearll.common.distributed import average_gradients, is_distributed
 from pearll.common.type_aliases import UpdaterLog
 from pearll.models.actor_critics import Actor, ActorCritic
 
@@ -27,10 +28,10 @@ class BaseActorUpdater(ABC):
 
     def _get_model_parameters(
         self, model: Union[Actor, ActorCritic]
-    ) -> Iterator[Parameter]:
+    ) -> List[Parameter]:
         """Get the actor model parameters"""
         if isinstance(model, Actor):
-            return model.parameters()
+            return list(model.parameters())
         else:
             params = []
             for actor in model.actors:
@@ -41,11 +42,13 @@ class BaseActorUpdater(ABC):
         self,
         optimizer: T.optim.Optimizer,
         loss: T.Tensor,
-        actor_parameters: Iterator[Parameter],
+        actor_parameters: List[Parameter],
     ) -> None:
         """Run an optimization step"""
         optimizer.zero_grad(set_to_none=True)
         loss.backward()
+        if is_distributed():
+            average_gradients(actor_parameters)
         if self.max_grad > 0:
             T.nn.utils.clip_grad_norm_(actor_parameters, self.max_grad)
         optimizer.step()
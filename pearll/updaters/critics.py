@@ -1,9 +1,12 @@
+import inspect
+import weakref
 from abc import ABC, abstractmethod
-from typing import Iterator, Type, Union
+from typing import List, Optional, Type, Union
 
 import torch as T
 from torch.nn.parameter import Parameter
 
+from pearll.common.distributed import average_gradients, is_distributed
 from pearll.common.type_aliases import UpdaterLog
 from pearll.models.actor_critics import ActorCritic, Critic
 
@@ -26,28 +29,83 @@ class BaseCriticUpdater(ABC):
         self.loss_class = loss_class
         self.optimizer_class = optimizer_class
         self.max_grad = max_grad
+        self._optimizer = None
+        self._params = None
+        self._model_ref = None
 
     def _get_model_parameters(
         self, model: Union[Critic, ActorCritic]
-    ) -> Iterator[Parameter]:
-        """Get the critic model parameters"""
-        if isinstance(model, Critic):
-            return model.parameters()
+    ) -> List[Parameter]:
+        """
+        Get the critic model parameters, collected once per model and cached.
+        If a different model is passed, the parameters are collected again and
+        the optimizer is rebuilt on the next call to `_get_optimizer`.
+        """
+        # Compare against a weak reference, a freed model's id can be reused by a new model
+        if self._model_ref is None or self._model_ref() is not model:
+            self._model_ref = weakref.ref(model)
+            self._optimizer = None
+            if isinstance(model, Critic):
+                self._params = list(model.parameters())
+            else:
+                self._params = [
+                    param
+                    for critic in model.critics
+                    for param in critic.model.parameters()
+                ]
+        return self._params
+
+    def _get_optimizer(
+        self, model: Union[Critic, ActorCritic], learning_rate: float
+    ) -> T.optim.Optimizer:
+        """
+        Get the optimizer, building it on the first call so its internal state
+        (e.g. Adam moment estimates) persists between optimization steps.
+        When training over multiple processes, the optimizer state is sharded
+        across them with a `ZeroRedundancyOptimizer`. If the optimizer supports it,
+        the fused (CUDA) or foreach implementation is used to update all parameters
+        in a few kernel launches.
+
+        :param model: the model on which the optimization should be run
+        :param learning_rate: the learning rate for the optimizer algorithm
+        :return: the optimizer
+        """
+        params = self._get_model_parameters(model)
+        if self._optimizer is None:
+            optimizer_kwargs = {"lr": learning_rate}
+            optimizer_args = inspect.signature(self.optimizer_class).parameters
+            if "fused" in optimizer_args and all(param.is_cuda for param in params):
+                optimizer_kwargs["fused"] = True
+            elif "foreach" in optimizer_args:
+                optimizer_kwargs["foreach"] = True
+            if is_distributed():
+                from torch.distributed.optim import ZeroRedundancyOptimizer
+
+                self._optimizer = ZeroRedundancyOptimizer(
+                    params, optimizer_class=self.optimizer_class, **optimizer_kwargs
+                )
+            else:
+                self._optimizer = self.optimizer_class(params, **optimizer_kwargs)
         else:
-            params = []
-            for critic in model.critics:
-                params.extend(critic.model.parameters())
-            return params
+            for param_group in self._optimizer.param_groups:
+                param_group["lr"] = learning_rate
+        return self._optimizer
 
     def run_optimizer(
         self,
         optimizer: T.optim.Optimizer,
         loss: T.Tensor,
-        critic_parameters: Iterator[Parameter],
+        critic_parameters: List[Parameter],
     ) -> None:
-        """Run an optimization step"""
+        """
+        Run an optimization step. Gradients are clipped by their global norm over all
+        critic parameters, passed as a list so the norm and rescaling run as
+        multi-tensor (foreach) operations.
+        """
         optimizer.zero_grad(set_to_none=True)
         loss.backward()
+        if is_distributed():
+            average_gradients(critic_parameters)
         if self.max_grad > 0:
             T.nn.utils.clip_grad_norm_(critic_parameters, self.max_grad)
         optimizer.step()
@@ -57,9 +115,10 @@ class BaseCriticUpdater(ABC):
         """Run an optimization step"""
 
 
-class ValueRegression(BaseCriticUpdater):
+class CriticRegression(BaseCriticUpdater):
     """
-    Regression for a value function estimator
+    Shared regression of critic outputs onto a target, derived classes define the
+    inputs needed for their type of critic
 
     :param loss_class: the distance loss class for regression, defaults to MSE
     :param optimizer_class: the type of optimizer to use, defaults to Adam
@@ -76,11 +135,13 @@ class ValueRegression(BaseCriticUpdater):
             loss_class=loss_class, optimizer_class=optimizer_class, max_grad=max_grad
         )
 
-    def __call__(
+    def _regress(
         self,
         model: Union[Critic, ActorCritic],
         observations: T.Tensor,
         returns: T.Tensor,
+        actions: Optional[T.Tensor] = None,
+        actions_index: Optional[T.Tensor] = None,
         learning_rate: float = 0.001,
         loss_coeff: float = 1,
     ) -> UpdaterLog:
@@ -90,43 +151,73 @@ class ValueRegression(BaseCriticUpdater):
         :param model: the model on which the optimization should be run
         :param observations: observation inputs
         :param returns: the target to regress to (e.g. TD Values, Monte-Carlo Values)
+        :param actions: optional action inputs to the critic
+        :param actions_index: optional discrete action values to use as indices to filter
+            the critic outputs
         :param learning_rate: the learning rate for the optimizer algorithm
-        :param loss_coeff: the coefficient for the value loss, defaults to 1
+        :param loss_coeff: the coefficient for the loss, defaults to 1
         """
         critic_parameters = self._get_model_parameters(model)
-        optimizer = self.optimizer_class(critic_parameters, lr=learning_rate)
+        optimizer = self._get_optimizer(model, learning_rate)
 
         if isinstance(model, Critic):
-            values = model(observations)
+            outputs = model(observations, actions)
         else:
-            values = model.forward_critics(observations)
+            outputs = model.forward_critics(observations, actions)
+        if actions_index is not None:
+            outputs = T.gather(outputs, dim=-1, index=actions_index.long())
 
-        loss = loss_coeff * self.loss_class(values, returns)
+        loss = loss_coeff * self.loss_class(outputs, returns)
 
         self.run_optimizer(optimizer, loss, critic_parameters)
 
         return UpdaterLog(loss=loss.detach())
 
 
-class ContinuousQRegression(BaseCriticUpdater):
+class ValueRegression(CriticRegression):
     """
-    Regression for a continuous Q function estimator
+    Regression for a value function estimator
 
     :param loss_class: the distance loss class for regression, defaults to MSE
     :param optimizer_class: the type of optimizer to use, defaults to Adam
     :param max_grad: maximum gradient clip value, defaults to no clipping with a value of 0
     """
 
-    def __init__(
+    def __call__(
         self,
-        loss_class: T.nn.Module = T.nn.MSELoss(),
-        optimizer_class: Type[T.optim.Optimizer] = T.optim.Adam,
-        max_grad: float = 0,
-    ) -> None:
-        super().__init__(
-            loss_class=loss_class, optimizer_class=optimizer_class, max_grad=max_grad
+        model: Union[Critic, ActorCritic],
+        observations: T.Tensor,
+        returns: T.Tensor,
+        learning_rate: float = 0.001,
+        loss_coeff: float = 1,
+    ) -> UpdaterLog:
+        """
+        Perform an optimization step
+
+        :param model: the model on which the optimization should be run
+        :param observations: observation inputs
+        :param returns: the target to regress to (e.g. TD Values, Monte-Carlo Values)
+        :param learning_rate: the learning rate for the optimizer algorithm
+        :param loss_coeff: the coefficient for the value loss, defaults to 1
+        """
+        return self._regress(
+            model,
+            observations,
+            returns,
+            learning_rate=learning_rate,
+            loss_coeff=loss_coeff,
         )
 
+
+class ContinuousQRegression(CriticRegression):
+    """
+    Regression for a continuous Q function estimator
+
+    :param loss_class: the distance loss class for regression, defaults to MSE
+    :param optimizer_class: the type of optimizer to use, defaults to Adam
+    :param max_grad: maximum gradient clip value, defaults to no clipping with a value of 0
+    """
+
     def __call__(
         self,
         model: Union[Critic, ActorCritic],
@@ -146,22 +237,17 @@ class ContinuousQRegression(BaseCriticUpdater):
         :param learning_rate: the learning rate for the optimizer algorithm
         :param loss_coeff: the coefficient for the Q loss, defaults to 1
         """
-        critic_parameters = self._get_model_parameters(model)
-        optimizer = self.optimizer_class(critic_parameters, lr=learning_rate)
-
-        if isinstance(model, Critic):
-            q_values = model(observations, actions)
-        else:
-            q_values = model.forward_critics(observations, actions)
-
-        loss = loss_coeff * self.loss_class(q_values, returns)
-
-        self.run_optimizer(optimizer, loss, critic_parameters)
-
-        return UpdaterLog(loss=loss.detach())
+        return self._regress(
+            model,
+            observations,
+            returns,
+            actions=actions,
+            learning_rate=learning_rate,
+            loss_coeff=loss_coeff,
+        )
 
 
-class DiscreteQRegression(BaseCriticUpdater):
+class DiscreteQRegression(CriticRegression):
     """
     Regression for a discrete Q function estimator
 
@@ -170,16 +256,6 @@ class DiscreteQRegression(BaseCriticUpdater):
     :param max_grad: maximum gradient clip value, defaults to no clipping with a value of 0
     """
 
-    def __init__(
-        self,
-        loss_class: T.nn.Module = T.nn.MSELoss(),
-        optimizer_class: Type[T.optim.Optimizer] = T.optim.Adam,
-        max_grad: float = 0,
-    ) -> None:
-        super().__init__(
-            loss_class=loss_class, optimizer_class=optimizer_class, max_grad=max_grad
-        )
-
     def __call__(
         self,
         model: Union[Critic, ActorCritic],
@@ -200,17 +276,11 @@ class DiscreteQRegression(BaseCriticUpdater):
         :param learning_rate: the learning rate for the optimizer algorithm
         :param loss_coeff: the coefficient for the Q loss, defaults to 1
         """
-        critic_parameters = self._get_model_parameters(model)
-        optimizer = self.optimizer_class(critic_parameters, lr=learning_rate)
-
-        if isinstance(model, Critic):
-            q_values = model(observations)
-        else:
-            q_values = model.forward_critics(observations)
-        q_values = T.gather(q_values, dim=-1, index=actions_index.long())
-
-        loss = loss_coeff * self.loss_class(q_values, returns)
-
-        self.run_optimizer(optimizer, loss, critic_parameters)
-
-        return UpdaterLog(loss=loss.detach().item())
+        return self._regress(
+            model,
+            observations,
+            returns,
+            actions_index=actions_index,
+            learning_rate=learning_rate,
+            loss_coeff=loss_coeff,
+        )
@@ -1,9 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import Iterator, Type
+from typing import List, Type
 
 import torch as T
 from torch.nn import functional as F
 
+from pearll.common.distributed import average_gradients, is_distributed
 from pearll.common.type_aliases import UpdaterLog
 from pearll.models.actor_critics import Model
 
@@ -25,11 +26,13 @@ class BaseDeepUpdater(ABC):
         self,
         optimizer: T.optim.Optimizer,
         loss: T.Tensor,
-        model_parameters: Iterator[T.nn.Parameter],
+        model_parameters: List[T.nn.Parameter],
     ) -> None:
         """Run an optimization step"""
         optimizer.zero_grad(set_to_none=True)
         loss.backward()
+        if is_distributed():
+            average_gradients(model_parameters)
         if self.max_grad > 0:
             T.nn.utils.clip_grad_norm_(model_parameters, self.max_grad)
         optimizer.step()
@@ -92,7 +95,7 @@ class DeepRegression(BaseDeepUpdater):
         :param mode: The mode to use, defaults to auto. If set to anything else, no processing
             will be done on the targets and predictions for different loss functions.
         """
-        params = model.parameters()
+        params = list(model.parameters())
         predictions = model(observations, actions)
 
         if mode == "auto":
@@ -6,6 +6,7 @@ import torch as T
 from gym.spaces import Discrete, MultiDiscrete
 from torch.distributions import Normal, kl_divergence
 
+from pearll.common.distributed import is_distributed
 from pearll.common.type_aliases import (
     CrossoverFunc,
     MutationFunc,
@@ -24,6 +25,10 @@ class BaseEvolutionUpdater(ABC):
     """
 
     def __init__(self, model: ActorCritic, population_type: str = "actor") -> None:
+        if is_distributed():
+            raise NotImplementedError(
+                "Evolutionary updaters don't synchronize populations across processes"
+            )
         self.model = model
         self.population_type = population_type
         if population_type == "actor":
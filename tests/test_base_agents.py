@@ -1,18 +1,26 @@
+import copy
 import shutil
 
 import gym
 import numpy as np
+import pytest
 import torch as T
 
 from pearll.agents.base_agents import BaseAgent
 from pearll.buffers import ReplayBuffer
+from pearll.callbacks import BaseCallback
 from pearll.common.type_aliases import Log
 from pearll.common.utils import set_seed
 from pearll.models.actor_critics import Actor, ActorCritic, Critic
 from pearll.models.encoders import IdentityEncoder
 from pearll.models.heads import ContinuousQHead
 from pearll.models.torsos import MLP
-from pearll.settings import ExplorerSettings, LoggerSettings
+from pearll.settings import (
+    ExplorerSettings,
+    LoggerSettings,
+    MiscellaneousSettings,
+    Settings,
+)
 
 
 class MockRLAgent(BaseAgent):
@@ -102,4 +110,74 @@ def test_deep_fit():
     assert vec_deep_agent.episode == 1
 
 
-shutil.rmtree("runs/tests")
+def test_fit_flushes_logs_on_error():
+    class FailingAgent(MockRLAgent):
+        def _fit(self, batch_size, actor_epochs=1, critic_epochs=1):
+            raise RuntimeError("training failed")
+
+    agent = FailingAgent(
+        env=env,
+        model=model,
+        buffer_class=ReplayBuffer,
+        logger_settings=LoggerSettings(
+            tensorboard_log_path="runs/tests", write_frequency=10
+        ),
+    )
+    agent.logger._log_buffer.append((0, Log(reward=0)))
+
+    with pytest.raises(RuntimeError):
+        agent.fit(num_steps=2, batch_size=1)
+    assert agent.logger._log_buffer == []
+
+
+def test_fit_ends_callbacks():
+    class EndCallback(BaseCallback):
+        ended = False
+
+        def _on_step(self):
+            return True
+
+        def on_training_end(self):
+            EndCallback.ended = True
+
+    agent = MockRLAgent(
+        env=env,
+        model=model,
+        buffer_class=ReplayBuffer,
+        callbacks=[EndCallback],
+        callback_settings=[Settings()],
+        logger_settings=LoggerSettings(tensorboard_log_path="runs/tests"),
+    )
+
+    agent.fit(num_steps=2, batch_size=1)
+    assert EndCallback.ended
+
+
+@pytest.mark.skipif(
+    not hasattr(T.nn.Module, "compile"), reason="torch.compile not supported"
+)
+def test_compile_critics():
+    compiled_model = copy.deepcopy(model)
+    observation = T.ones(3)
+    expected_q_values = compiled_model.forward_critics(observation)
+    MockRLAgent(
+        env=env,
+        model=compiled_model,
+        buffer_class=ReplayBuffer,
+        logger_settings=LoggerSettings(tensorboard_log_path="runs/tests"),
+        misc_settings=MiscellaneousSettings(compile_critics=True),
+    )
+    assert all(
+        critic._compiled_call_impl is not None for critic in compiled_model.critics
+    )
+    actual_q_values = compiled_model.forward_critics(observation)
+    T.testing.assert_close(actual_q_values, expected_q_values)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def remove_logs():
+    yield
+    # Stop the writer threads before removing their directory
+    deep_agent.logger.writer.close()
+    vec_deep_agent.logger.writer.close()
+    shutil.rmtree("runs/tests")
@@ -1,8 +1,11 @@
+from dataclasses import fields
+
 import gym
 import numpy as np
 import pytest
 import torch as T
 
+from pearll import settings
 from pearll.buffers import ReplayBuffer
 from pearll.buffers.rollout_buffer import RolloutBuffer
 from pearll.common.type_aliases import Trajectories
@@ -20,6 +23,51 @@ def test_buffer_init(buffer_class):
     assert buffer.dones.shape == (5, 1)
 
 
+@pytest.mark.parametrize("buffer_class", [ReplayBuffer, RolloutBuffer])
+def test_buffer_observation_dtype(buffer_class):
+    buffer = buffer_class(env, buffer_size=2, observation_dtype=np.float16)
+    obs = env.reset()
+    action = env.action_space.sample()
+    next_obs, reward, done, _ = env.step(action)
+    buffer.add_trajectory(obs, action, reward, next_obs, done)
+
+    trajectory = buffer.sample(batch_size=1)
+
+    assert buffer.observations.dtype == np.float16
+    assert trajectory.observations.dtype == T.float16
+    np.testing.assert_allclose(
+        obs, trajectory.observations.numpy().reshape(4), rtol=1e-3
+    )
+
+
+@pytest.mark.skipif(not T.cuda.is_available(), reason="CUDA not available")
+@pytest.mark.parametrize("buffer_class", [ReplayBuffer, RolloutBuffer])
+def test_buffer_sample_cuda(buffer_class, monkeypatch):
+    buffer = buffer_class(env, buffer_size=10, observation_dtype=np.float16)
+    obs = env.reset()
+    for _ in range(8):
+        action = env.action_space.sample()
+        next_obs, reward, done, _ = env.step(action)
+        buffer.add_trajectory(obs, action, reward, next_obs, done)
+        obs = env.reset() if done else next_obs
+
+    # Sample the same indices on each device
+    rng_state = np.random.get_state()
+    monkeypatch.setattr(settings, "DEVICE", "cpu")
+    cpu_trajectory = buffer.sample(batch_size=4)
+    np.random.set_state(rng_state)
+    monkeypatch.setattr(settings, "DEVICE", "cuda")
+    cuda_trajectory = buffer.sample(batch_size=4)
+    T.cuda.synchronize()
+
+    for field in fields(Trajectories):
+        cpu_data = getattr(cpu_trajectory, field.name)
+        cuda_data = getattr(cuda_trajectory, field.name)
+        assert cuda_data.is_cuda
+        assert cuda_data.dtype == cpu_data.dtype
+        assert T.equal(cuda_data.cpu(), cpu_data)
+
+
 @pytest.mark.parametrize("buffer_class", [ReplayBuffer, RolloutBuffer])
 def test_buffer_add_trajectory_and_sample(buffer_class):
     action_space = env.action_space
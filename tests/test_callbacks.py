@@ -0,0 +1,62 @@
+import os
+import shutil
+
+import pytest
+import torch as T
+
+from pearll.callbacks import CheckpointCallback
+from pearll.common.logging_ import Logger
+from pearll.models.actor_critics import Actor, ActorCritic, Critic
+from pearll.models.encoders import IdentityEncoder
+from pearll.models.heads import ContinuousQHead, DiagGaussianHead
+from pearll.models.torsos import MLP
+
+path = "runs/tests"
+
+
+def make_model():
+    encoder = IdentityEncoder()
+    torso = MLP(layer_sizes=[3, 16], activation_fn=T.nn.ReLU)
+    actor = Actor(encoder, torso, DiagGaussianHead(input_shape=16, action_size=1))
+    critic = Critic(encoder, torso, ContinuousQHead(input_shape=16))
+    return ActorCritic(actor=actor, critic=critic)
+
+
+def test_checkpoint_save_load():
+    logger = Logger(tensorboard_log_path=path)
+    model = make_model()
+    callback = CheckpointCallback(
+        logger, model, save_freq=1, save_path=os.path.join(path, "checkpoints")
+    )
+    expected_state_dict = {k: v.clone() for k, v in model.state_dict().items()}
+
+    checkpoint_path = os.path.join(path, "checkpoints", "agent")
+    callback.save(checkpoint_path)
+    # Weights changed after saving must not leak into the checkpoint
+    with T.no_grad():
+        for param in model.parameters():
+            param.add_(1)
+
+    callback.load(checkpoint_path)
+    actual_state_dict = model.state_dict()
+
+    shutil.rmtree(path)
+    assert actual_state_dict.keys() == expected_state_dict.keys()
+    for key, value in expected_state_dict.items():
+        T.testing.assert_close(actual_state_dict[key], value)
+
+
+def test_checkpoint_training_end():
+    logger = Logger(tensorboard_log_path=path)
+    model = make_model()
+    callback = CheckpointCallback(
+        logger, model, save_freq=1, save_path=os.path.join(path, "checkpoints")
+    )
+
+    # The directory doesn't exist so the background write fails
+    callback.save(os.path.join(path, "missing", "agent"))
+
+    with pytest.raises(RuntimeError):
+        callback.on_training_end()
+    shutil.rmtree(path)
+    assert callback._io_pool is None
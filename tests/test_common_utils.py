@@ -8,6 +8,7 @@ from pearll.common.utils import (
     extend_shape,
     filter_dataclass_by_none,
     filter_rewards,
+    get_space_dtype,
     get_space_range,
     get_space_shape,
     set_seed,
@@ -61,6 +62,16 @@ def test_one_input():
     T.equal(actual_output, one_torch)
 
 
+def test_to_numpy_cpu_view():
+    tensor = T.zeros(2, 2)
+    actual_output = to_numpy(tensor)
+    assert np.shares_memory(actual_output, tensor.numpy())
+
+    tensor = T.zeros(2, 2, requires_grad=True)
+    actual_output = to_numpy(tensor)
+    np.testing.assert_array_equal(actual_output, np.zeros((2, 2)))
+
+
 def test_extend_shape():
     shape = (1, 1, 1)
 
@@ -116,6 +127,22 @@ def test_get_space_range(space):
         assert actual_output == expected_output
 
 
+@pytest.mark.parametrize(
+    "space, expected_output",
+    [
+        (spaces.Box(low=0, high=1, shape=(2, 2)), np.float32),
+        (spaces.Discrete(2), np.int64),
+        (spaces.Tuple([spaces.Discrete(2), spaces.Discrete(2)]), np.int64),
+        (
+            spaces.Dict({"observation": spaces.Box(low=0, high=1, shape=(2,))}),
+            np.float32,
+        ),
+    ],
+)
+def test_get_space_dtype(space, expected_output):
+    assert get_space_dtype(space) == expected_output
+
+
 def test_filter_dataclass_by_none():
     dataclass_example = ExplorerSettings()
     actual_output = filter_dataclass_by_none(dataclass_example)
@@ -164,6 +191,7 @@ def test_filter_rewards():
     actual_output = filter_rewards(rewards, dones)
     expected_output = np.array([[1, 1, 1, 1, 0], [1, 1, 0, 0, 0]])
     np.testing.assert_array_equal(actual_output, expected_output)
+    np.testing.assert_array_equal(rewards, np.ones((2, 5)))
 
     rewards = np.ones(5)
     dones = np.array([0, 0, 0, 1, 1])
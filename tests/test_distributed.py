@@ -0,0 +1,203 @@
+import copy
+from datetime import timedelta
+
+import gym
+import pytest
+import torch as T
+from torch.distributed.optim import ZeroRedundancyOptimizer
+
+from pearll import settings
+from pearll.agents.base_agents import BaseAgent
+from pearll.buffers import ReplayBuffer
+from pearll.callbacks.base_callback import BaseCallback
+from pearll.common.distributed import (
+    all_processes_continue,
+    average_gradients,
+    broadcast_parameters,
+    get_rank,
+    is_distributed,
+)
+from pearll.common.logging_ import Logger
+from pearll.common.type_aliases import Log
+from pearll.models.actor_critics import Actor, ActorCritic, Critic
+from pearll.models.encoders import IdentityEncoder
+from pearll.models.heads import ContinuousQHead, DeterministicHead, ValueHead
+from pearll.models.torsos import MLP
+from pearll.settings import LoggerSettings, PopulationSettings, Settings
+from pearll.updaters.critics import ValueRegression
+from pearll.updaters.evolution import NoisyGradientAscent
+
+
+@pytest.fixture
+def process_group(tmp_path):
+    T.distributed.init_process_group(
+        backend="gloo", init_method=f"file://{tmp_path / 'store'}", rank=0, world_size=1
+    )
+    yield
+    T.distributed.destroy_process_group()
+
+
+def init_worker(rank, worker, tmp_path, world_size, backend):
+    # Time out rather than hang if the processes get out of step
+    T.distributed.init_process_group(
+        backend=backend,
+        init_method=f"file://{tmp_path}/store",
+        rank=rank,
+        world_size=world_size,
+        timeout=timedelta(seconds=30),
+    )
+    try:
+        worker(rank, tmp_path)
+    finally:
+        T.distributed.destroy_process_group()
+
+
+def run_workers(worker, tmp_path, world_size=2, backend="gloo"):
+    T.multiprocessing.spawn(
+        init_worker,
+        args=(worker, str(tmp_path), world_size, backend),
+        nprocs=world_size,
+    )
+
+
+def average_gradients_worker(rank, tmp_path):
+    model = MLP(layer_sizes=[2, 3, 1])
+    params = list(model.parameters())
+    for param in params:
+        param.grad = T.full_like(param, rank + 1)
+
+    average_gradients(params)
+
+    for param in params:
+        assert T.equal(param.grad, T.full_like(param, 1.5))
+
+
+def all_processes_continue_worker(rank, tmp_path):
+    assert all_processes_continue(True)
+    assert not all_processes_continue(rank == 0)
+    assert not all_processes_continue(False)
+
+
+def nccl_continue_worker(rank, tmp_path):
+    # Only the pearll device is set, not the current CUDA device
+    settings.DEVICE = f"cuda:{rank}"
+    assert all_processes_continue(True)
+    assert not all_processes_continue(rank == 0)
+
+
+class StopCallback(BaseCallback):
+    def _on_step(self) -> bool:
+        return self.step < 5
+
+
+class MockRLAgent(BaseAgent):
+    num_fits = 0
+
+    def _fit(self, batch_size, actor_epochs=1, critic_epochs=1):
+        T.distributed.all_reduce(T.zeros(1))
+        self.num_fits += 1
+        return Log()
+
+
+def fit_worker(rank, tmp_path):
+    env = gym.make("Pendulum-v0")
+    encoder = IdentityEncoder()
+    torso = MLP(layer_sizes=[3, 8])
+    model = ActorCritic(
+        actor=Actor(encoder, torso, DeterministicHead(input_shape=8, action_shape=1)),
+        critic=Critic(encoder, torso, ContinuousQHead(input_shape=8)),
+    )
+    # Only one process is stopped by its callback
+    agent = MockRLAgent(
+        env=env,
+        model=model,
+        buffer_class=ReplayBuffer,
+        callbacks=[StopCallback] if rank == 1 else None,
+        callback_settings=[Settings()] if rank == 1 else None,
+        logger_settings=LoggerSettings(tensorboard_log_path=f"{tmp_path}/runs"),
+    )
+
+    agent.fit(num_steps=20, batch_size=1)
+
+    assert agent.num_fits == 5
+
+
+def test_not_distributed():
+    assert not is_distributed()
+    assert get_rank() == 0
+    assert all_processes_continue(True)
+    assert not all_processes_continue(False)
+
+
+def test_average_gradients(tmp_path):
+    run_workers(average_gradients_worker, tmp_path)
+
+
+def test_all_processes_continue(tmp_path):
+    run_workers(all_processes_continue_worker, tmp_path)
+
+
+@pytest.mark.skipif(
+    T.cuda.device_count() < 2 or not T.distributed.is_nccl_available(),
+    reason="needs 2 GPUs with NCCL",
+)
+def test_all_processes_continue_nccl(tmp_path):
+    run_workers(nccl_continue_worker, tmp_path, backend="nccl")
+
+
+def test_fit_stops_all_processes(tmp_path):
+    run_workers(fit_worker, tmp_path)
+
+
+def test_broadcast_parameters(process_group):
+    model = MLP(layer_sizes=[2, 3, 1])
+    expected = copy.deepcopy(model.state_dict())
+
+    broadcast_parameters(model)
+
+    for key, value in model.state_dict().items():
+        assert T.equal(value, expected[key])
+
+
+def test_critic_updater_shards_optimizer(process_group):
+    critic = Critic(
+        encoder=IdentityEncoder(),
+        torso=MLP(layer_sizes=[2, 2]),
+        head=ValueHead(input_shape=2, activation_fn=None),
+    )
+    observation = T.rand(2)
+    out_before = critic(observation)
+    updater = ValueRegression()
+
+    updater(critic, observation, T.rand(1))
+
+    assert isinstance(updater._optimizer, ZeroRedundancyOptimizer)
+    assert not T.equal(critic(observation), out_before)
+
+
+def test_evolution_updater_not_supported(process_group):
+    actor = Actor(
+        encoder=IdentityEncoder(),
+        torso=MLP(layer_sizes=[2, 2]),
+        head=DeterministicHead(input_shape=2, action_shape=1),
+    )
+    critic = Critic(
+        encoder=IdentityEncoder(),
+        torso=MLP(layer_sizes=[2, 2]),
+        head=ValueHead(input_shape=2),
+    )
+    model = ActorCritic(
+        actor,
+        critic,
+        population_settings=PopulationSettings(
+            actor_population_size=2, actor_distribution="normal"
+        ),
+    )
+
+    with pytest.raises(NotImplementedError):
+        NoisyGradientAscent(model)
+
+
+def test_logger_rank_zero_writes(process_group, tmp_path):
+    logger = Logger(tensorboard_log_path=str(tmp_path / "runs"))
+    assert logger.writer is not None
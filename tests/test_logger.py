@@ -1,3 +1,4 @@
+import logging
 import shutil
 
 import numpy as np
@@ -82,3 +83,43 @@ def test_stream_log():
     logger.error("test")
     logger.exception("test")
     shutil.rmtree(path)
+
+
+def test_write_log_buffer():
+    logger = Logger(tensorboard_log_path=path, write_frequency=2)
+    logger.rewards = [1]
+
+    logger.write_log(step=0)
+    assert len(logger._log_buffer) == 1
+
+    logger.write_log(step=1)
+    assert logger._log_buffer == []
+
+    logger.write_log(step=2)
+    logger.flush_log()
+    # Stop the writer thread before removing its directory
+    logger.writer.close()
+    shutil.rmtree(path)
+    assert logger._log_buffer == []
+
+
+def test_debug_lazy_formatting():
+    class Message:
+        formatted = False
+
+        def __str__(self):
+            Message.formatted = True
+            return "message"
+
+    logger = Logger(
+        tensorboard_log_path=path,
+        file_handler_level=logging.INFO,
+        stream_handler_level=logging.INFO,
+    )
+    logger.debug("%s", Message())
+    assert not Message.formatted
+
+    logger = Logger(tensorboard_log_path=path)
+    logger.debug("%s", Message())
+    shutil.rmtree(path)
+    assert Message.formatted
@@ -83,6 +83,10 @@ def test_cnn_encoder():
 
     assert output.shape == (1, 512)
 
+    # Observations stored at a lower precision are cast to float32
+    output = encoder(T.ones((1, 1, 64, 64), dtype=T.float16))
+    assert output.dtype == T.float32
+
 
 @pytest.mark.parametrize("head_class", [ValueHead, ContinuousQHead, DiscreteQHead])
 @pytest.mark.parametrize("input_shape", [5, (5,)])
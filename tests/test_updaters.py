@@ -329,6 +329,91 @@ def test_continuous_q_regression(model: Union[Critic, ActorCritic]):
         assert same_distribution(actor_before, actor_after)
 
 
+def test_critic_updater_reuses_optimizer():
+    model = copy.deepcopy(critic)
+    observation = T.rand(2)
+    returns = T.rand(1)
+    updater = ValueRegression()
+
+    updater(model, observation, returns, learning_rate=0.1)
+    optimizer = updater._optimizer
+    params = updater._params
+    state = copy.deepcopy(optimizer.state_dict()["state"])
+    updater(model, observation, returns, learning_rate=0.01)
+
+    assert updater._optimizer is optimizer
+    assert updater._params is params
+    assert len(params) == len(list(model.parameters()))
+    assert optimizer.param_groups[0]["lr"] == 0.01
+    # Adam step counts persist between calls
+    assert all(
+        optimizer.state_dict()["state"][i]["step"] == state[i]["step"] + 1
+        for i in state
+    )
+
+
+def test_critic_updater_new_model():
+    model = copy.deepcopy(critic)
+    new_model = copy.deepcopy(critic)
+    observation = T.ones(2)
+    returns = T.ones(1)
+    updater = ValueRegression()
+
+    updater(model, observation, returns)
+    optimizer = updater._optimizer
+    updater(new_model, observation, returns)
+
+    assert updater._optimizer is not optimizer
+    new_params = set(new_model.parameters())
+    assert all(param in new_params for param in updater._params)
+    assert all(
+        param in new_params
+        for param_group in updater._optimizer.param_groups
+        for param in param_group["params"]
+    )
+
+
+def test_critic_updater_freed_model():
+    observation = T.ones(2)
+    returns = T.ones(1)
+    updater = ValueRegression()
+
+    # Each model is freed before the next is made, so a new model can reuse its id
+    for _ in range(100):
+        model = copy.deepcopy(critic)
+        updater(model, observation, returns)
+        model_params = set(model.parameters())
+        assert all(param in model_params for param in updater._params)
+        del model, model_params
+
+
+@pytest.mark.parametrize("model", [critic, marl])
+def test_critic_updater_clips_global_grad_norm(model: Union[Critic, ActorCritic]):
+    model = copy.deepcopy(model)
+    observation = T.ones(2)
+    if isinstance(model, ActorCritic):
+        observation = observation.repeat(model.num_critics, 1)
+    returns = T.ones(1) * 100
+    updater = ValueRegression(max_grad=1e-3)
+
+    updater(model, observation, returns)
+
+    grads = [param.grad for param in updater._params if param.grad is not None]
+    total_norm = T.norm(T.stack([T.norm(grad) for grad in grads]))
+    assert total_norm <= 1e-3 + 1e-6
+
+
+@pytest.mark.parametrize("optimizer_class", [T.optim.Adam, T.optim.SGD])
+def test_critic_updater_multi_tensor_optimizer(optimizer_class):
+    model = copy.deepcopy(critic)
+    updater = ValueRegression(optimizer_class=optimizer_class)
+
+    updater(model, T.rand(2), T.rand(1))
+
+    assert isinstance(updater._optimizer, optimizer_class)
+    assert updater._optimizer.defaults["foreach"]
+
+
 ############################### TEST EVOLUTION UPDATERS ###############################
 
 
@@ -358,7 +443,7 @@ class DiscreteSphere(gym.Env):
         self.observation_space = gym.spaces.Discrete(1)
 
     def step(self, action):
-        return 0, -(action ** 2), False, {}
+        return 0, -(action**2), False, {}
 
     def reset(self):
         return 0